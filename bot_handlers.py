@@ -3,29 +3,33 @@ Telegram bot handlers for Singapore weather commands
 """
 
 import asyncio
+import bisect
 import logging
+import time
+from html import escape
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
 from weather_api import WeatherAPI
 from config import (
-    STATION_ALIASES, get_wind_direction_text, 
-    MAX_MESSAGE_LENGTH, STATIONS_PER_PAGE
+    lookup_station, get_wind_direction_text, get_compass_arrow,
+    MAX_MESSAGE_LENGTH, STATIONS_PER_PAGE, STATIONS_MESSAGE_TTL
 )
 
 logger = logging.getLogger(__name__)
 
-async def start_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle /start command"""
-    welcome_message = """
-🌤️ **Singapore Weather Bot**
+# Static messages and keyboard, built once at import
+_WELCOME = """
+🌤️ <b>Singapore Weather Bot</b>
 
 Welcome! I provide real-time weather data from Singapore's government APIs.
 
-**Quick Start:**
+<b>Quick Start:</b>
 /menu - Interactive menu with all options 🎯
 
-**Available Commands:**
+<b>Available Commands:</b>
 /weather - Get complete weather overview
 /rainfall [station|all] - Get rainfall data
 /windspeed [station|all] - Get wind speed data  
@@ -34,71 +38,69 @@ Welcome! I provide real-time weather data from Singapore's government APIs.
 /stations - List all available stations
 /help - Show detailed help message
 
-**Examples:**
-• `/weather` - Overall weather summary
-• `/rainfall marina` - Rainfall at Marina area
-• `/rainfall all` - All stations with rainfall data
-• `/windspeed S108` - Wind speed at station S108
-• `/wind marina` - Complete wind data for Marina area
-• `/wind all` - Complete wind data from all stations
+<b>Examples:</b>
+• <code>/weather</code> - Overall weather summary
+• <code>/rainfall marina</code> - Rainfall at Marina area
+• <code>/rainfall all</code> - All stations with rainfall data
+• <code>/windspeed S108</code> - Wind speed at station S108
+• <code>/wind marina</code> - Complete wind data for Marina area
+• <code>/wind all</code> - Complete wind data from all stations
 
 Type /menu for an interactive interface or /help for detailed instructions.
 """
-    
-    await update.message.reply_text(
-        welcome_message,
-        parse_mode=ParseMode.MARKDOWN
-    )
 
-async def help_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle /help command and unknown commands"""
-    help_message = """
-🌤️ **Singapore Weather Bot Help**
+_HELP = """
+🌤️ <b>Singapore Weather Bot Help</b>
 
-**Quick Access:**
-🎯 `/menu` - Interactive menu with buttons for all commands
+<b>Quick Access:</b>
+🎯 <code>/menu</code> - Interactive menu with buttons for all commands
 
-**Commands:**
+<b>Commands:</b>
 
-🌦️ `/weather` - Complete weather overview
+🌦️ <code>/weather</code> - Complete weather overview
 • Shows rainfall, wind speed, and wind direction summary
 • Displays data from all active stations
 
-🌧️ `/rainfall [station|all]` - Rainfall information
+🌧️ <code>/rainfall [station|all]</code> - Rainfall information
 • Without station: Shows overall rainfall summary
 • With station: Shows specific station rainfall
-• With `all`: Shows all stations with rainfall data
+• With <code>all</code>: Shows all stations with rainfall data
 • Unit: millimeters (mm)
 
-💨 `/windspeed [station|all]` - Wind speed information  
+💨 <code>/windspeed [station|all]</code> - Wind speed information  
 • Without station: Shows overall wind speed summary
 • With station: Shows specific station wind speed
-• With `all`: Shows all stations with wind speed data
+• With <code>all</code>: Shows all stations with wind speed data
 • Unit: knots
 
-🧭 `/winddirection [station|all]` - Wind direction information
+🧭 <code>/winddirection [station|all]</code> - Wind direction information
 • Without station: Shows overall wind direction summary  
 • With station: Shows specific station wind direction
-• With `all`: Shows all stations with wind direction data
+• With <code>all</code>: Shows all stations with wind direction data
 • Unit: degrees (with compass direction)
 
-🌬️ `/wind [station|all]` - Complete wind data  
+🌬️ <code>/wind [station|all]</code> - Complete wind data  
 • Without station: Shows overall wind summary
 • With station: Shows specific station wind speed and direction
-• With `all`: Shows all stations with complete wind data
+• With <code>all</code>: Shows all stations with complete wind data
 • Combined view of wind speed and direction
 
-📍 `/stations` - List all monitoring stations
+📍 <code>/stations</code> - List all monitoring stations
 • Shows station IDs, names, and locations
 • Use station ID or name in other commands
 
-**Station Examples:**
-• Use station ID: `S108`, `S60`, `S107`
-• Use station name: `marina`, `sentosa`, `changi`
-• Use partial name: `jurong`, `woodlands`, `clementi`
-• Use `all` to see all stations: `/rainfall all`
+<b>Station Examples:</b>
+• Use station ID: <code>S108</code>, <code>S60</code>, <code>S107</code>
+• Use station name: <code>marina</code>, <code>sentosa</code>, <code>changi</code>
+• Use partial name: <code>jurong</code>, <code>woodlands</code>, <code>clementi</code>
+• Use <code>all</code> to see all stations: <code>/rainfall all</code>
+
+<b>Usage Examples:</b>
+• <code>/rainfall S108</code> - Get rainfall at Marina Gardens
+• <code>/windspeed marina</code> - Get wind speed at Marina area
+• <code>/winddirection sentosa</code> - Get wind direction at Sentosa
 
-**Tips:**
+<b>Tips:</b>
 • Station names are case-insensitive
 • Partial matches work (e.g., "marina" finds "Marina Gardens Drive")
 • Data is updated every few minutes
@@ -106,930 +108,925 @@ async def help_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 Need help? Just type /help anytime!
 """
-    
-    await update.message.reply_text(
-        help_message,
-        parse_mode=ParseMode.MARKDOWN
-    )
 
-async def menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle /menu command - show interactive menu"""
-    menu_text = """
-🌤️ **Singapore Weather Bot Menu**
+_MENU_TEXT = """
+🌤️ <b>Singapore Weather Bot Menu</b>
 
 Choose an option below to get weather data:
     """
+
+_MENU_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🌦️ Complete Weather", callback_data="weather")],
+    [InlineKeyboardButton("🌧️ Rainfall Summary", callback_data="rainfall"),
+     InlineKeyboardButton("🌧️ All Rainfall", callback_data="rainfall_all")],
+    [InlineKeyboardButton("💨 Wind Speed Summary", callback_data="windspeed"),
+     InlineKeyboardButton("💨 All Wind Speed", callback_data="windspeed_all")],
+    [InlineKeyboardButton("🧭 Wind Direction Summary", callback_data="winddirection"),
+     InlineKeyboardButton("🧭 All Wind Direction", callback_data="winddirection_all")],
+    [InlineKeyboardButton("🌬️ Complete Wind Data", callback_data="wind")],
+    [InlineKeyboardButton("📍 All Stations", callback_data="stations")]
+])
+
+# Data types reported by a station, as bit flags
+_HAS_RAINFALL = 1
+_HAS_WIND_SPEED = 2
+_HAS_WIND_DIRECTION = 4
+
+# /stations indicator emojis for every combination of the flags above
+_STATION_INDICATORS = tuple(
+    ("🌧️" if flags & _HAS_RAINFALL else "")
+    + ("💨" if flags & _HAS_WIND_SPEED else "")
+    + ("🧭" if flags & _HAS_WIND_DIRECTION else "")
+    for flags in range(8)
+)
+
+# Rendered /stations chunks: (rendered_at, station roster key, chunks)
+_stations_message_cache = None
+
+# Rainfall intensity: upper bounds (mm) for light/moderate/heavy, and labels
+# for none, light, moderate, heavy and very heavy rainfall
+_RAINFALL_THRESHOLDS = (2.5, 10, 50)
+_RAINFALL_LABELS = (
+    "☀️ <i>No rainfall detected</i>",
+    "🌦️ <i>Light rainfall</i>",
+    "🌧️ <i>Moderate rainfall</i>",
+    "⛈️ <i>Heavy rainfall</i>",
+    "🌩️ <i>Very heavy rainfall</i>"
+)
+
+def _parse_station_query(context: ContextTypes.DEFAULT_TYPE) -> Tuple[Optional[str], Optional[str]]:
+    """Get the station query from command arguments as (original, lowercased)"""
+    if not context.args:
+        return None, None
+    
+    if len(context.args) == 1:
+        query_text = context.args[0]
+    else:
+        query_text = ' '.join(context.args).strip()
+    
+    if not query_text:
+        return None, None
+    return query_text, query_text.lower()
+
+def _merge_station_types(all_stations: Dict[str, Dict], payload: Dict, flag: int):
+    """Add the stations in an API payload to all_stations, setting a _HAS_* flag"""
+    for station in payload['data']['stations']:
+        entry = all_stations.setdefault(station['id'], {
+            'name': station['name'],
+            'location': station['location'],
+            'flags': 0
+        })
+        entry['flags'] |= flag
+
+def _split_message(parts: List[str], separator: str) -> List[str]:
+    """Pack message parts into chunks of at most MAX_MESSAGE_LENGTH characters"""
+    chunks = []
+    current = []
+    current_len = 0
+    
+    for part in parts:
+        part_len = len(part) + (len(separator) if current else 0)
+        if current and current_len + part_len > MAX_MESSAGE_LENGTH:
+            chunks.append(separator.join(current))
+            current = [part]
+            current_len = len(part)
+        else:
+            current.append(part)
+            current_len += part_len
     
-    # Create inline keyboard with menu options
-    keyboard = [
-        [InlineKeyboardButton("🌦️ Complete Weather", callback_data="weather")],
-        [InlineKeyboardButton("🌧️ Rainfall Summary", callback_data="rainfall"),
-         InlineKeyboardButton("🌧️ All Rainfall", callback_data="rainfall_all")],
-        [InlineKeyboardButton("💨 Wind Speed Summary", callback_data="windspeed"),
-         InlineKeyboardButton("💨 All Wind Speed", callback_data="windspeed_all")],
-        [InlineKeyboardButton("🧭 Wind Direction Summary", callback_data="winddirection"),
-         InlineKeyboardButton("🧭 All Wind Direction", callback_data="winddirection_all")],
-        [InlineKeyboardButton("🌬️ Complete Wind Data", callback_data="wind")],
-        [InlineKeyboardButton("📍 All Stations", callback_data="stations")]
-    ]
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
+
+async def _reply_chunks(update: Update, chunks: List[str]):
+    """Send message chunks in order, skipping blank ones
     
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    A failed send is logged and the remaining chunks are still delivered.
+    """
+    for chunk in chunks:
+        if not chunk.strip():
+            continue
+        try:
+            await update.effective_message.reply_text(chunk, parse_mode=ParseMode.HTML)
+        except Exception as e:
+            logger.error("Error sending message chunk: %s", e)
+
+async def _fetch_with_placeholder(update: Update, text: str, fetch):
+    """Await fetch while the placeholder message is sent concurrently
     
-    await update.message.reply_text(
-        menu_text,
-        reply_markup=reply_markup,
-        parse_mode=ParseMode.MARKDOWN
+    The placeholder is always delivered before this returns, so replies sent
+    afterwards still appear below it. A failed placeholder send is only
+    logged, so it never replaces the fetch's result or error.
+    """
+    placeholder = asyncio.create_task(update.effective_message.reply_text(text))
+    try:
+        return await fetch
+    finally:
+        try:
+            await placeholder
+        except Exception as e:
+            logger.error("Error sending placeholder message: %s", e)
+
+async def start_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /start command"""
+    await update.effective_message.reply_text(_WELCOME, parse_mode=ParseMode.HTML)
+
+async def help_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /help command and unknown commands"""
+    await update.effective_message.reply_text(_HELP, parse_mode=ParseMode.HTML)
+
+async def menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /menu command - show interactive menu"""
+    await update.effective_message.reply_text(
+        _MENU_TEXT,
+        reply_markup=_MENU_KEYBOARD,
+        parse_mode=ParseMode.HTML
     )
 
 async def weather_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /weather command - complete weather overview"""
-    await update.message.reply_text("🔄 Fetching complete weather data...")
-    
     try:
-        async with WeatherAPI() as api:
-            rainfall_data, wind_speed_data, wind_direction_data = await api.get_all_weather_data()
-            
-            if not any([rainfall_data, wind_speed_data, wind_direction_data]):
-                await update.message.reply_text(
-                    "❌ **Error**: Unable to fetch weather data. Please try again later.",
-                    parse_mode=ParseMode.MARKDOWN
-                )
-                return
-            
-            message_parts = ["🌤️ **Singapore Weather Overview**\n"]
-            
-            # Rainfall summary
-            if rainfall_data:
-                rainfall_stats = api.get_summary_stats(rainfall_data['data']['readings'])
-                timestamp = api.format_timestamp(rainfall_data['data']['readings'][0]['timestamp'])
-                
-                message_parts.append(f"🌧️ **Rainfall** (as of {timestamp})")
-                message_parts.append(f"• Average: {rainfall_stats['avg']:.1f} mm")
-                message_parts.append(f"• Range: {rainfall_stats['min']:.1f} - {rainfall_stats['max']:.1f} mm")
-                message_parts.append(f"• Active stations: {rainfall_stats['count']}")
-                
-                if rainfall_stats['max'] > 0:
-                    # Find station with highest rainfall
-                    max_station = None
-                    max_value = 0
-                    latest_reading = rainfall_data['data']['readings'][0]
-                    
-                    for data_point in latest_reading['data']:
-                        if data_point['value'] > max_value:
-                            max_value = data_point['value']
-                            station = api.find_station_by_id(rainfall_data['data']['stations'], data_point['stationId'])
-                            if station:
-                                max_station = station['name']
-                    
-                    if max_station:
-                        message_parts.append(f"• Highest: {max_value:.1f} mm at {max_station}")
-                
-                message_parts.append("")
-            
-            # Wind speed summary
-            if wind_speed_data:
-                wind_stats = api.get_summary_stats(wind_speed_data['data']['readings'])
-                timestamp = api.format_timestamp(wind_speed_data['data']['readings'][0]['timestamp'])
-                
-                message_parts.append(f"💨 **Wind Speed** (as of {timestamp})")
-                message_parts.append(f"• Average: {wind_stats['avg']:.1f} knots")
-                message_parts.append(f"• Range: {wind_stats['min']:.1f} - {wind_stats['max']:.1f} knots")
-                message_parts.append(f"• Active stations: {wind_stats['count']}")
-                message_parts.append("")
+        api = WeatherAPI.instance()
+        rainfall_data, wind_speed_data, wind_direction_data = await _fetch_with_placeholder(
+            update, "🔄 Fetching complete weather data...", api.get_all_weather_data()
+        )
+        
+        if not any([rainfall_data, wind_speed_data, wind_direction_data]):
+            await update.effective_message.reply_text(
+                "❌ <b>Error</b>: Unable to fetch weather data. Please try again later.",
+                parse_mode=ParseMode.HTML
+            )
+            return
+        
+        message_parts = ["🌤️ <b>Singapore Weather Overview</b>\n"]
+        
+        # Rainfall summary
+        if rainfall_data:
+            rainfall_stats = api.get_summary_stats(
+                rainfall_data['data']['readings'], rainfall_data['data']['stations'], k=1
+            )
+            timestamp = api.format_timestamp(rainfall_data['data']['readings'][0]['timestamp'])
             
-            # Wind direction summary
-            if wind_direction_data:
-                timestamp = api.format_timestamp(wind_direction_data['data']['readings'][0]['timestamp'])
-                message_parts.append(f"🧭 **Wind Direction** (as of {timestamp})")
-                message_parts.append(f"• Data available from {len(wind_direction_data['data']['stations'])} stations")
-                message_parts.append("")
+            message_parts.append(f"🌧️ <b>Rainfall</b> (as of {timestamp})")
+            message_parts.append(f"• Average: {rainfall_stats['avg']:.1f} mm")
+            message_parts.append(f"• Range: {rainfall_stats['min']:.1f} - {rainfall_stats['max']:.1f} mm")
+            message_parts.append(f"• Active stations: {rainfall_stats['count']}")
             
-            message_parts.append("💡 *Use /rainfall, /windspeed, or /winddirection with a station name for specific data*")
+            if rainfall_stats['max_station'] and rainfall_stats['max_station'][1] > 0:
+                max_name, max_value = rainfall_stats['max_station']
+                message_parts.append(f"• Highest: {max_value:.1f} mm at {escape(max_name)}")
             
-            message = "\n".join(message_parts)
+            message_parts.append("")
+        
+        # Wind speed summary
+        if wind_speed_data:
+            wind_stats = api.get_summary_stats(wind_speed_data['data']['readings'])
+            timestamp = api.format_timestamp(wind_speed_data['data']['readings'][0]['timestamp'])
             
-            # Split message if too long
-            if len(message) > MAX_MESSAGE_LENGTH:
-                parts = message.split("\n\n")
-                current_message = parts[0]
-                
-                for part in parts[1:]:
-                    if len(current_message + "\n\n" + part) > MAX_MESSAGE_LENGTH:
-                        await update.message.reply_text(current_message, parse_mode=ParseMode.MARKDOWN)
-                        current_message = part
-                    else:
-                        current_message += "\n\n" + part
-                
-                if current_message:
-                    await update.message.reply_text(current_message, parse_mode=ParseMode.MARKDOWN)
-            else:
-                await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
-    
+            message_parts.append(f"💨 <b>Wind Speed</b> (as of {timestamp})")
+            message_parts.append(f"• Average: {wind_stats['avg']:.1f} knots")
+            message_parts.append(f"• Range: {wind_stats['min']:.1f} - {wind_stats['max']:.1f} knots")
+            message_parts.append(f"• Active stations: {wind_stats['count']}")
+            message_parts.append("")
+        
+        # Wind direction summary
+        if wind_direction_data:
+            timestamp = api.format_timestamp(wind_direction_data['data']['readings'][0]['timestamp'])
+            message_parts.append(f"🧭 <b>Wind Direction</b> (as of {timestamp})")
+            message_parts.append(f"• Data available from {len(wind_direction_data['data']['stations'])} stations")
+            message_parts.append("")
+        
+        message_parts.append("💡 <i>Use /rainfall, /windspeed, or /winddirection with a station name for specific data</i>")
+        
+        message = "\n".join(message_parts)
+        
+        # Split message if too long
+        if len(message) > MAX_MESSAGE_LENGTH:
+            await _reply_chunks(update, _split_message(message.split("\n\n"), "\n\n"))
+        else:
+            await update.effective_message.reply_text(message, parse_mode=ParseMode.HTML)
+
     except Exception as e:
-        logger.error(f"Error in weather_handler: {e}")
-        await update.message.reply_text(
-            "❌ **Error**: Failed to fetch weather data. Please try again later.",
-            parse_mode=ParseMode.MARKDOWN
+        logger.error("Error in weather_handler: %s", e)
+        await update.effective_message.reply_text(
+            "❌ <b>Error</b>: Failed to fetch weather data. Please try again later.",
+            parse_mode=ParseMode.HTML
         )
 
 async def rainfall_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /rainfall command"""
-    await update.message.reply_text("🔄 Fetching rainfall data...")
-    
     try:
-        async with WeatherAPI() as api:
-            rainfall_data = await api.get_rainfall_data()
+        api = WeatherAPI.instance()
+        rainfall_data = await _fetch_with_placeholder(
+            update, "🔄 Fetching rainfall data...", api.get_rainfall_data()
+        )
+        
+        if not rainfall_data:
+            await update.effective_message.reply_text(
+                "❌ <b>Error</b>: Unable to fetch rainfall data. Please try again later.",
+                parse_mode=ParseMode.HTML
+            )
+            return
+        
+        stations = rainfall_data['data']['stations']
+        readings = rainfall_data['data']['readings']
+        
+        # Check if user specified a station or "all"
+        query_text, station_query = _parse_station_query(context)
+        
+        if station_query == "all":
+            # Show all stations data
+            timestamp = api.format_timestamp(readings[0]['timestamp'])
+            message_parts = [f"🌧️ <b>All Rainfall Stations</b>\n", f"📅 <b>Time</b>: {timestamp}\n"]
+            
+            # Get all station readings, keeping stations without data apart
+            with_value = []
+            without_value = []
+            stations_by_id = api.stations_by_id(stations)
+            latest_reading = readings[0]
+            
+            for data_point in latest_reading['data']:
+                station = stations_by_id.get(data_point['stationId'].upper())
+                if station:
+                    reading = (station['name'], station['id'], data_point['value'])
+                    if reading[2] is None:
+                        without_value.append(reading)
+                    else:
+                        with_value.append(reading)
+            
+            # Sort by rainfall amount (descending), stations without data last
+            with_value.sort(key=itemgetter(2), reverse=True)
+            station_readings = with_value + without_value
             
-            if not rainfall_data:
-                await update.message.reply_text(
-                    "❌ **Error**: Unable to fetch rainfall data. Please try again later.",
-                    parse_mode=ParseMode.MARKDOWN
+            # Build message with all stations
+            for name, station_id, value in station_readings:
+                if value is not None:
+                    message_parts.append(f"📍 <b>{escape(name)}</b> ({station_id}): {value:.1f} mm")
+                else:
+                    message_parts.append(f"📍 <b>{escape(name)}</b> ({station_id}): No data")
+            
+            message_parts.append("")
+            message_parts.append("💡 <i>Use <code>/rainfall [station]</code> for specific station details</i>")
+            message = "\n".join(message_parts)
+            
+        elif station_query:
+            # Find specific station
+            station = api.resolve_station(stations, station_query)
+            
+            if not station:
+                await update.effective_message.reply_text(
+                    f"❌ <b>Station not found</b>: '{escape(query_text)}'\n\n"
+                    "Use /stations to see available stations, or try:\n"
+                    "• Station ID (e.g., S108)\n"
+                    "• Station name (e.g., Marina)\n"
+                    "• Partial name (e.g., jurong)\n"
+                    "• Use <code>all</code> to see all stations",
+                    parse_mode=ParseMode.HTML
                 )
                 return
             
-            stations = rainfall_data['data']['stations']
-            readings = rainfall_data['data']['readings']
+            # Get reading for specific station
+            reading = api.get_station_reading(readings, station['id'])
+            timestamp = api.format_timestamp(readings[0]['timestamp'])
             
-            # Check if user specified a station or "all"
-            station_query = ' '.join(context.args).strip() if context.args else None
+            message = f"🌧️ <b>Rainfall Data</b>\n\n"
+            message += f"📍 <b>Station</b>: {escape(station['name'])} ({station['id']})\n"
+            message += f"📅 <b>Time</b>: {timestamp}\n"
+            message += f"🌧️ <b>Rainfall</b>: {reading if reading is not None else 'No data'} mm\n\n"
             
-            if station_query and station_query.lower() == "all":
-                # Show all stations data
-                timestamp = api.format_timestamp(readings[0]['timestamp'])
-                message = f"🌧️ **All Rainfall Stations**\n\n"
-                message += f"📅 **Time**: {timestamp}\n\n"
-                
-                # Get all station readings
-                station_readings = []
-                latest_reading = readings[0]
-                
-                for data_point in latest_reading['data']:
-                    station = api.find_station_by_id(stations, data_point['stationId'])
-                    if station:
-                        station_readings.append((station['name'], station['id'], data_point['value']))
-                
-                # Sort by rainfall amount (descending)
-                station_readings.sort(key=lambda x: x[2] if x[2] is not None else 0, reverse=True)
-                
-                # Build message with all stations
-                for name, station_id, value in station_readings:
-                    if value is not None:
-                        message += f"📍 **{name}** ({station_id}): {value:.1f} mm\n"
-                    else:
-                        message += f"📍 **{name}** ({station_id}): No data\n"
-                
-                message += f"\n💡 *Use `/rainfall [station]` for specific station details*"
-                
-            elif station_query:
-                # Find specific station
-                station_id = STATION_ALIASES.get(station_query.lower())
-                if station_id:
-                    station = api.find_station_by_id(stations, station_id)
+            if reading is not None:
+                if reading == 0:
+                    message += _RAINFALL_LABELS[0]
                 else:
-                    station = api.find_station_by_name(stations, station_query)
-                    if not station:
-                        station = api.find_station_by_id(stations, station_query)
+                    message += _RAINFALL_LABELS[1 + bisect.bisect_right(_RAINFALL_THRESHOLDS, reading)]
+            
+        else:
+            # Show overall summary
+            stats = api.get_summary_stats(readings, stations)
+            timestamp = api.format_timestamp(readings[0]['timestamp'])
+            
+            message = f"🌧️ <b>Rainfall Summary</b>\n\n"
+            message += f"📅 <b>Time</b>: {timestamp}\n"
+            message += f"📊 <b>Statistics</b>:\n"
+            message += f"• Average: {stats['avg']:.1f} mm\n"
+            message += f"• Minimum: {stats['min']:.1f} mm\n"
+            message += f"• Maximum: {stats['max']:.1f} mm\n"
+            message += f"• Active stations: {stats['count']}\n\n"
+            
+            if stats['max'] > 0:
+                # Show top 3 stations with highest rainfall
+                station_values = [(name, value) for name, _, value in stats['top'] if value > 0]
                 
-                if not station:
-                    await update.message.reply_text(
-                        f"❌ **Station not found**: '{station_query}'\n\n"
-                        "Use /stations to see available stations, or try:\n"
-                        "• Station ID (e.g., S108)\n"
-                        "• Station name (e.g., Marina)\n"
-                        "• Partial name (e.g., jurong)\n"
-                        "• Use `all` to see all stations",
-                        parse_mode=ParseMode.MARKDOWN
+                if station_values:
+                    message += "🏆 <b>Top Rainfall Locations</b>:\n"
+                    message += "".join(
+                        f"{i}. {escape(name)}: {value:.1f} mm\n" for i, (name, value) in enumerate(station_values, 1)
                     )
-                    return
-                
-                # Get reading for specific station
-                reading = api.get_station_reading(readings, station['id'])
-                timestamp = api.format_timestamp(readings[0]['timestamp'])
-                
-                message = f"🌧️ **Rainfall Data**\n\n"
-                message += f"📍 **Station**: {station['name']} ({station['id']})\n"
-                message += f"📅 **Time**: {timestamp}\n"
-                message += f"🌧️ **Rainfall**: {reading if reading is not None else 'No data'} mm\n\n"
-                
-                if reading is not None:
-                    if reading == 0:
-                        message += "☀️ *No rainfall detected*"
-                    elif reading < 2.5:
-                        message += "🌦️ *Light rainfall*"
-                    elif reading < 10:
-                        message += "🌧️ *Moderate rainfall*"
-                    elif reading < 50:
-                        message += "⛈️ *Heavy rainfall*"
-                    else:
-                        message += "🌩️ *Very heavy rainfall*"
-                
             else:
-                # Show overall summary
-                stats = api.get_summary_stats(readings)
-                timestamp = api.format_timestamp(readings[0]['timestamp'])
-                
-                message = f"🌧️ **Rainfall Summary**\n\n"
-                message += f"📅 **Time**: {timestamp}\n"
-                message += f"📊 **Statistics**:\n"
-                message += f"• Average: {stats['avg']:.1f} mm\n"
-                message += f"• Minimum: {stats['min']:.1f} mm\n"
-                message += f"• Maximum: {stats['max']:.1f} mm\n"
-                message += f"• Active stations: {stats['count']}\n\n"
-                
-                if stats['max'] > 0:
-                    # Show top 3 stations with highest rainfall
-                    station_values = []
-                    latest_reading = readings[0]
-                    
-                    for data_point in latest_reading['data']:
-                        if data_point['value'] > 0:
-                            station = api.find_station_by_id(stations, data_point['stationId'])
-                            if station:
-                                station_values.append((station['name'], data_point['value']))
-                    
-                    if station_values:
-                        station_values.sort(key=lambda x: x[1], reverse=True)
-                        message += "🏆 **Top Rainfall Locations**:\n"
-                        for i, (name, value) in enumerate(station_values[:3], 1):
-                            message += f"{i}. {name}: {value:.1f} mm\n"
-                else:
-                    message += "☀️ *No rainfall detected across all stations*"
-                
-                message += f"\n\n💡 *Use `/rainfall [station]` for specific station data*"
+                message += "☀️ <i>No rainfall detected across all stations</i>"
             
-            await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
-    
+            message += f"\n\n💡 <i>Use <code>/rainfall [station]</code> for specific station data</i>"
+        
+        # Split message if too long
+        if len(message) > MAX_MESSAGE_LENGTH:
+            await _reply_chunks(update, _split_message(message.split('\n'), '\n'))
+        else:
+            await update.effective_message.reply_text(message, parse_mode=ParseMode.HTML)
+
     except Exception as e:
-        logger.error(f"Error in rainfall_handler: {e}")
-        await update.message.reply_text(
-            "❌ **Error**: Failed to fetch rainfall data. Please try again later.",
-            parse_mode=ParseMode.MARKDOWN
+        logger.error("Error in rainfall_handler: %s", e)
+        await update.effective_message.reply_text(
+            "❌ <b>Error</b>: Failed to fetch rainfall data. Please try again later.",
+            parse_mode=ParseMode.HTML
         )
 
 async def wind_speed_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /windspeed command"""
-    await update.message.reply_text("🔄 Fetching wind speed data...")
-    
     try:
-        async with WeatherAPI() as api:
-            wind_data = await api.get_wind_speed_data()
+        api = WeatherAPI.instance()
+        wind_data = await _fetch_with_placeholder(
+            update, "🔄 Fetching wind speed data...", api.get_wind_speed_data()
+        )
+        
+        if not wind_data:
+            await update.effective_message.reply_text(
+                "❌ <b>Error</b>: Unable to fetch wind speed data. Please try again later.",
+                parse_mode=ParseMode.HTML
+            )
+            return
+        
+        stations = wind_data['data']['stations']
+        readings = wind_data['data']['readings']
+        
+        # Check if user specified a station or "all"
+        query_text, station_query = _parse_station_query(context)
+        
+        if station_query == "all":
+            # Show all stations data
+            timestamp = api.format_timestamp(readings[0]['timestamp'])
+            message_parts = [f"💨 <b>All Wind Speed Stations</b>\n", f"📅 <b>Time</b>: {timestamp}\n"]
             
-            if not wind_data:
-                await update.message.reply_text(
-                    "❌ **Error**: Unable to fetch wind speed data. Please try again later.",
-                    parse_mode=ParseMode.MARKDOWN
+            # Get all station readings, keeping stations without data apart
+            with_value = []
+            without_value = []
+            stations_by_id = api.stations_by_id(stations)
+            latest_reading = readings[0]
+            
+            for data_point in latest_reading['data']:
+                station = stations_by_id.get(data_point['stationId'].upper())
+                if station:
+                    reading = (station['name'], station['id'], data_point['value'])
+                    if reading[2] is None:
+                        without_value.append(reading)
+                    else:
+                        with_value.append(reading)
+            
+            # Sort by wind speed (descending), stations without data last
+            with_value.sort(key=itemgetter(2), reverse=True)
+            station_readings = with_value + without_value
+            
+            # Build message with all stations
+            for name, station_id, value in station_readings:
+                if value is not None:
+                    message_parts.append(f"📍 <b>{escape(name)}</b> ({station_id}): {value:.1f} knots")
+                else:
+                    message_parts.append(f"📍 <b>{escape(name)}</b> ({station_id}): No data")
+            
+            message_parts.append("")
+            message_parts.append("💡 <i>Use <code>/windspeed [station]</code> for specific station details</i>")
+            message = "\n".join(message_parts)
+            
+        elif station_query:
+            # Find specific station
+            station = api.resolve_station(stations, station_query)
+            
+            if not station:
+                await update.effective_message.reply_text(
+                    f"❌ <b>Station not found</b>: '{escape(query_text)}'\n\n"
+                    "Wind speed data is only available at selected stations.\n"
+                    "Use /stations to see available stations or try <code>all</code> to see all stations.",
+                    parse_mode=ParseMode.HTML
                 )
                 return
             
-            stations = wind_data['data']['stations']
-            readings = wind_data['data']['readings']
+            # Get reading for specific station
+            reading = api.get_station_reading(readings, station['id'])
+            timestamp = api.format_timestamp(readings[0]['timestamp'])
             
-            # Check if user specified a station or "all"
-            station_query = ' '.join(context.args).strip() if context.args else None
+            message = f"💨 <b>Wind Speed Data</b>\n\n"
+            message += f"📍 <b>Station</b>: {escape(station['name'])} ({station['id']})\n"
+            message += f"📅 <b>Time</b>: {timestamp}\n"
+            message += f"💨 <b>Wind Speed</b>: {reading if reading is not None else 'No data'} knots\n\n"
             
-            if station_query and station_query.lower() == "all":
-                # Show all stations data
-                timestamp = api.format_timestamp(readings[0]['timestamp'])
-                message = f"💨 **All Wind Speed Stations**\n\n"
-                message += f"📅 **Time**: {timestamp}\n\n"
-                
-                # Get all station readings
-                station_readings = []
-                latest_reading = readings[0]
-                
-                for data_point in latest_reading['data']:
-                    station = api.find_station_by_id(stations, data_point['stationId'])
-                    if station:
-                        station_readings.append((station['name'], station['id'], data_point['value']))
-                
-                # Sort by wind speed (descending)
-                station_readings.sort(key=lambda x: x[2] if x[2] is not None else 0, reverse=True)
-                
-                # Build message with all stations
-                for name, station_id, value in station_readings:
-                    if value is not None:
-                        message += f"📍 **{name}** ({station_id}): {value:.1f} knots\n"
-                    else:
-                        message += f"📍 **{name}** ({station_id}): No data\n"
-                
-                message += f"\n💡 *Use `/windspeed [station]` for specific station details*"
-                
-            elif station_query:
-                # Find specific station
-                station_id = STATION_ALIASES.get(station_query.lower())
-                if station_id:
-                    station = api.find_station_by_id(stations, station_id)
+            if reading is not None:
+                # Wind speed categories (Beaufort scale approximation)
+                if reading < 1:
+                    message += "🌬️ <i>Calm</i>"
+                elif reading < 7:
+                    message += "🍃 <i>Light breeze</i>"
+                elif reading < 17:
+                    message += "💨 <i>Moderate breeze</i>"
+                elif reading < 28:
+                    message += "🌪️ <i>Strong breeze</i>"
                 else:
-                    station = api.find_station_by_name(stations, station_query)
-                    if not station:
-                        station = api.find_station_by_id(stations, station_query)
-                
-                if not station:
-                    await update.message.reply_text(
-                        f"❌ **Station not found**: '{station_query}'\n\n"
-                        "Wind speed data is only available at selected stations.\n"
-                        "Use /stations to see available stations or try `all` to see all stations.",
-                        parse_mode=ParseMode.MARKDOWN
-                    )
-                    return
-                
-                # Get reading for specific station
-                reading = api.get_station_reading(readings, station['id'])
-                timestamp = api.format_timestamp(readings[0]['timestamp'])
-                
-                message = f"💨 **Wind Speed Data**\n\n"
-                message += f"📍 **Station**: {station['name']} ({station['id']})\n"
-                message += f"📅 **Time**: {timestamp}\n"
-                message += f"💨 **Wind Speed**: {reading if reading is not None else 'No data'} knots\n\n"
-                
-                if reading is not None:
-                    # Wind speed categories (Beaufort scale approximation)
-                    if reading < 1:
-                        message += "🌬️ *Calm*"
-                    elif reading < 7:
-                        message += "🍃 *Light breeze*"
-                    elif reading < 17:
-                        message += "💨 *Moderate breeze*"
-                    elif reading < 28:
-                        message += "🌪️ *Strong breeze*"
-                    else:
-                        message += "⛈️ *Very strong wind*"
-                
-            else:
-                # Show overall summary
-                stats = api.get_summary_stats(readings)
-                timestamp = api.format_timestamp(readings[0]['timestamp'])
-                
-                message = f"💨 **Wind Speed Summary**\n\n"
-                message += f"📅 **Time**: {timestamp}\n"
-                message += f"📊 **Statistics**:\n"
-                message += f"• Average: {stats['avg']:.1f} knots\n"
-                message += f"• Minimum: {stats['min']:.1f} knots\n"
-                message += f"• Maximum: {stats['max']:.1f} knots\n"
-                message += f"• Active stations: {stats['count']}\n\n"
-                
-                # Show top 3 stations with highest wind speed
-                station_values = []
-                latest_reading = readings[0]
-                
-                for data_point in latest_reading['data']:
-                    if data_point['value'] is not None:
-                        station = api.find_station_by_id(stations, data_point['stationId'])
-                        if station:
-                            station_values.append((station['name'], data_point['value']))
-                
-                if station_values:
-                    station_values.sort(key=lambda x: x[1], reverse=True)
-                    message += "🏆 **Highest Wind Speed Locations**:\n"
-                    for i, (name, value) in enumerate(station_values[:3], 1):
-                        message += f"{i}. {name}: {value:.1f} knots\n"
-                
-                message += f"\n\n💡 *Use `/windspeed [station]` for specific station data*"
+                    message += "⛈️ <i>Very strong wind</i>"
             
-            await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
-    
+        else:
+            # Show overall summary
+            stats = api.get_summary_stats(readings, stations)
+            timestamp = api.format_timestamp(readings[0]['timestamp'])
+            
+            message = f"💨 <b>Wind Speed Summary</b>\n\n"
+            message += f"📅 <b>Time</b>: {timestamp}\n"
+            message += f"📊 <b>Statistics</b>:\n"
+            message += f"• Average: {stats['avg']:.1f} knots\n"
+            message += f"• Minimum: {stats['min']:.1f} knots\n"
+            message += f"• Maximum: {stats['max']:.1f} knots\n"
+            message += f"• Active stations: {stats['count']}\n\n"
+            
+            # Show top 3 stations with highest wind speed
+            if stats['top']:
+                message += "🏆 <b>Highest Wind Speed Locations</b>:\n"
+                message += "".join(
+                    f"{i}. {escape(name)}: {value:.1f} knots\n" for i, (name, _, value) in enumerate(stats['top'], 1)
+                )
+            
+            message += f"\n\n💡 <i>Use <code>/windspeed [station]</code> for specific station data</i>"
+        
+        # Split message if too long
+        if len(message) > MAX_MESSAGE_LENGTH:
+            await _reply_chunks(update, _split_message(message.split('\n'), '\n'))
+        else:
+            await update.effective_message.reply_text(message, parse_mode=ParseMode.HTML)
+
     except Exception as e:
-        logger.error(f"Error in wind_speed_handler: {e}")
-        await update.message.reply_text(
-            "❌ **Error**: Failed to fetch wind speed data. Please try again later.",
-            parse_mode=ParseMode.MARKDOWN
+        logger.error("Error in wind_speed_handler: %s", e)
+        await update.effective_message.reply_text(
+            "❌ <b>Error</b>: Failed to fetch wind speed data. Please try again later.",
+            parse_mode=ParseMode.HTML
         )
 
 async def wind_direction_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /winddirection command"""
-    await update.message.reply_text("🔄 Fetching wind direction data...")
-    
     try:
-        async with WeatherAPI() as api:
-            wind_data = await api.get_wind_direction_data()
+        api = WeatherAPI.instance()
+        wind_data = await _fetch_with_placeholder(
+            update, "🔄 Fetching wind direction data...", api.get_wind_direction_data()
+        )
+        
+        if not wind_data:
+            await update.effective_message.reply_text(
+                "❌ <b>Error</b>: Unable to fetch wind direction data. Please try again later.",
+                parse_mode=ParseMode.HTML
+            )
+            return
+        
+        stations = wind_data['data']['stations']
+        readings = wind_data['data']['readings']
+        
+        # Check if user specified a station or "all"
+        query_text, station_query = _parse_station_query(context)
+        
+        if station_query == "all":
+            # Show all stations data
+            timestamp = api.format_timestamp(readings[0]['timestamp'])
+            message_parts = [f"🧭 <b>All Wind Direction Stations</b>\n", f"📅 <b>Time</b>: {timestamp}\n"]
+            
+            # Get all station readings
+            station_readings = []
+            stations_by_id = api.stations_by_id(stations)
+            latest_reading = readings[0]
+            
+            for data_point in latest_reading['data']:
+                station = stations_by_id.get(data_point['stationId'].upper())
+                if station:
+                    station_readings.append((station['name'], station['id'], data_point['value']))
+            
+            # Sort by station name
+            station_readings.sort(key=itemgetter(0))
+            
+            # Build message with all stations
+            for name, station_id, value in station_readings:
+                if value is not None:
+                    direction_text = get_wind_direction_text(value)
+                    message_parts.append(f"📍 <b>{escape(name)}</b> ({station_id}): {value}° ({direction_text})")
+                else:
+                    message_parts.append(f"📍 <b>{escape(name)}</b> ({station_id}): No data")
+            
+            message_parts.append("")
+            message_parts.append("💡 <i>Use <code>/winddirection [station]</code> for specific station details</i>")
+            message = "\n".join(message_parts)
+            
+        elif station_query:
+            # Find specific station
+            station = api.resolve_station(stations, station_query)
             
-            if not wind_data:
-                await update.message.reply_text(
-                    "❌ **Error**: Unable to fetch wind direction data. Please try again later.",
-                    parse_mode=ParseMode.MARKDOWN
+            if not station:
+                await update.effective_message.reply_text(
+                    f"❌ <b>Station not found</b>: '{escape(query_text)}'\n\n"
+                    "Wind direction data is only available at selected stations.\n"
+                    "Use /stations to see available stations or try <code>all</code> to see all stations.",
+                    parse_mode=ParseMode.HTML
                 )
                 return
             
-            stations = wind_data['data']['stations']
-            readings = wind_data['data']['readings']
+            # Get reading for specific station
+            reading = api.get_station_reading(readings, station['id'])
+            timestamp = api.format_timestamp(readings[0]['timestamp'])
             
-            # Check if user specified a station or "all"
-            station_query = ' '.join(context.args).strip() if context.args else None
+            message = f"🧭 <b>Wind Direction Data</b>\n\n"
+            message += f"📍 <b>Station</b>: {escape(station['name'])} ({station['id']})\n"
+            message += f"📅 <b>Time</b>: {timestamp}\n"
             
-            if station_query and station_query.lower() == "all":
-                # Show all stations data
-                timestamp = api.format_timestamp(readings[0]['timestamp'])
-                message = f"🧭 **All Wind Direction Stations**\n\n"
-                message += f"📅 **Time**: {timestamp}\n\n"
-                
-                # Get all station readings
-                station_readings = []
-                latest_reading = readings[0]
-                
-                for data_point in latest_reading['data']:
-                    station = api.find_station_by_id(stations, data_point['stationId'])
-                    if station:
-                        station_readings.append((station['name'], station['id'], data_point['value']))
-                
-                # Sort by station name
-                station_readings.sort(key=lambda x: x[0])
-                
-                # Build message with all stations
-                for name, station_id, value in station_readings:
-                    if value is not None:
-                        direction_text = get_wind_direction_text(value)
-                        message += f"📍 **{name}** ({station_id}): {value}° ({direction_text})\n"
-                    else:
-                        message += f"📍 **{name}** ({station_id}): No data\n"
-                
-                message += f"\n💡 *Use `/winddirection [station]` for specific station details*"
-                
-            elif station_query:
-                # Find specific station
-                station_id = STATION_ALIASES.get(station_query.lower())
-                if station_id:
-                    station = api.find_station_by_id(stations, station_id)
-                else:
-                    station = api.find_station_by_name(stations, station_query)
-                    if not station:
-                        station = api.find_station_by_id(stations, station_query)
-                
-                if not station:
-                    await update.message.reply_text(
-                        f"❌ **Station not found**: '{station_query}'\n\n"
-                        "Wind direction data is only available at selected stations.\n"
-                        "Use /stations to see available stations or try `all` to see all stations.",
-                        parse_mode=ParseMode.MARKDOWN
-                    )
-                    return
-                
-                # Get reading for specific station
-                reading = api.get_station_reading(readings, station['id'])
-                timestamp = api.format_timestamp(readings[0]['timestamp'])
-                
-                message = f"🧭 **Wind Direction Data**\n\n"
-                message += f"📍 **Station**: {station['name']} ({station['id']})\n"
-                message += f"📅 **Time**: {timestamp}\n"
-                
-                if reading is not None:
-                    direction_text = get_wind_direction_text(reading)
-                    message += f"🧭 **Direction**: {reading}° ({direction_text})\n\n"
-                    
-                    # Add compass emoji based on direction
-                    if 337.5 <= reading or reading < 22.5:
-                        message += "⬆️ *Wind from North*"
-                    elif 22.5 <= reading < 67.5:
-                        message += "↗️ *Wind from Northeast*"
-                    elif 67.5 <= reading < 112.5:
-                        message += "➡️ *Wind from East*"
-                    elif 112.5 <= reading < 157.5:
-                        message += "↘️ *Wind from Southeast*"
-                    elif 157.5 <= reading < 202.5:
-                        message += "⬇️ *Wind from South*"
-                    elif 202.5 <= reading < 247.5:
-                        message += "↙️ *Wind from Southwest*"
-                    elif 247.5 <= reading < 292.5:
-                        message += "⬅️ *Wind from West*"
-                    elif 292.5 <= reading < 337.5:
-                        message += "↖️ *Wind from Northwest*"
-                else:
-                    message += f"🧭 **Direction**: No data\n"
+            if reading is not None:
+                direction_text = get_wind_direction_text(reading)
+                message += f"🧭 <b>Direction</b>: {reading}° ({direction_text})\n\n"
                 
+                # Add compass emoji based on direction
+                arrow, name = get_compass_arrow(reading)
+                message += f"{arrow} <i>Wind from {name}</i>"
             else:
-                # Show overall summary
-                timestamp = api.format_timestamp(readings[0]['timestamp'])
-                
-                message = f"🧭 **Wind Direction Summary**\n\n"
-                message += f"📅 **Time**: {timestamp}\n"
-                message += f"📊 **Available from {len(stations)} stations**\n\n"
-                
-                # Show all station directions
-                station_directions = []
-                latest_reading = readings[0]
-                
-                for data_point in latest_reading['data']:
-                    if data_point['value'] is not None:
-                        station = api.find_station_by_id(stations, data_point['stationId'])
-                        if station:
-                            direction_text = get_wind_direction_text(data_point['value'])
-                            station_directions.append((station['name'], data_point['value'], direction_text))
-                
-                if station_directions:
-                    station_directions.sort(key=lambda x: x[0])  # Sort by station name
-                    message += "🏆 **Wind Directions by Station**:\n"
-                    for name, degrees, direction in station_directions:
-                        message += f"• {name}: {degrees}° ({direction})\n"
-                
-                message += f"\n\n💡 *Use `/winddirection [station]` for specific station data*"
+                message += f"🧭 <b>Direction</b>: No data\n"
             
-            await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
-    
+        else:
+            # Show overall summary
+            timestamp = api.format_timestamp(readings[0]['timestamp'])
+            
+            message = f"🧭 <b>Wind Direction Summary</b>\n\n"
+            message += f"📅 <b>Time</b>: {timestamp}\n"
+            message += f"📊 <b>Available from {len(stations)} stations</b>\n\n"
+            
+            # Show all station directions
+            station_directions = []
+            stations_by_id = api.stations_by_id(stations)
+            latest_reading = readings[0]
+            
+            for data_point in latest_reading['data']:
+                if data_point['value'] is not None:
+                    station = stations_by_id.get(data_point['stationId'].upper())
+                    if station:
+                        direction_text = get_wind_direction_text(data_point['value'])
+                        station_directions.append((station['name'], data_point['value'], direction_text))
+            
+            if station_directions:
+                station_directions.sort(key=itemgetter(0))  # Sort by station name
+                message += "🏆 <b>Wind Directions by Station</b>:\n"
+                message += "".join(
+                    f"• {escape(name)}: {degrees}° ({direction})\n" for name, degrees, direction in station_directions
+                )
+            
+            message += f"\n\n💡 <i>Use <code>/winddirection [station]</code> for specific station data</i>"
+        
+        # Split message if too long
+        if len(message) > MAX_MESSAGE_LENGTH:
+            await _reply_chunks(update, _split_message(message.split('\n'), '\n'))
+        else:
+            await update.effective_message.reply_text(message, parse_mode=ParseMode.HTML)
+
     except Exception as e:
-        logger.error(f"Error in wind_direction_handler: {e}")
-        await update.message.reply_text(
-            "❌ **Error**: Failed to fetch wind direction data. Please try again later.",
-            parse_mode=ParseMode.MARKDOWN
+        logger.error("Error in wind_direction_handler: %s", e)
+        await update.effective_message.reply_text(
+            "❌ <b>Error</b>: Failed to fetch wind direction data. Please try again later.",
+            parse_mode=ParseMode.HTML
         )
 
+def _render_stations_message(all_stations: Dict[str, Dict]) -> List[str]:
+    """Render the /stations listing as one or more message chunks"""
+    # Sort stations by name
+    rows = [(station_info['name'], station_id, station_info) for station_id, station_info in all_stations.items()]
+    rows.sort(key=itemgetter(0))
+    
+    # Create station list message
+    message_parts = ["📍 <b>Available Weather Stations</b>\n"]
+    
+    for _, station_id, station_info in rows:
+        indicators_str = _STATION_INDICATORS[station_info['flags']]
+        station_line = f"{indicators_str} {escape(station_info['name'])} ({station_id})"
+        message_parts.append(station_line)
+    
+    message_parts.append("\n<b>Legend:</b>")
+    message_parts.append("🌧️ Rainfall data available")
+    message_parts.append("💨 Wind speed data available")
+    message_parts.append("🧭 Wind direction data available")
+    message_parts.append("\nSee /help for usage examples")
+    
+    message = "\n".join(message_parts)
+    
+    # Split message if too long
+    if len(message) <= MAX_MESSAGE_LENGTH:
+        return [message]
+    return _split_message(message_parts, "\n")
+
 async def stations_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /stations command"""
-    await update.message.reply_text("🔄 Fetching station information...")
+    global _stations_message_cache
     
     try:
-        async with WeatherAPI() as api:
-            # Get data from all APIs to show which stations support which data types
-            rainfall_data, wind_speed_data, wind_direction_data = await api.get_all_weather_data()
-            
+        api = WeatherAPI.instance()
+        # Get data from all APIs to show which stations support which data types
+        rainfall_data, wind_speed_data, wind_direction_data = await _fetch_with_placeholder(
+            update, "🔄 Fetching station information...", api.get_all_weather_data()
+        )
+        
+        # The rendered list only depends on which stations report each data type
+        roster_key = tuple(
+            frozenset(station['id'] for station in payload['data']['stations']) if payload else None
+            for payload in (rainfall_data, wind_speed_data, wind_direction_data)
+        )
+        
+        if (_stations_message_cache is not None
+                and _stations_message_cache[1] == roster_key
+                and time.monotonic() - _stations_message_cache[0] < STATIONS_MESSAGE_TTL):
+            chunks = _stations_message_cache[2]
+        else:
             all_stations = {}
             
             # Collect all stations and their data types
-            if rainfall_data:
-                for station in rainfall_data['data']['stations']:
-                    all_stations[station['id']] = {
-                        'name': station['name'],
-                        'location': station['location'],
-                        'data_types': ['rainfall']
-                    }
-            
-            if wind_speed_data:
-                for station in wind_speed_data['data']['stations']:
-                    if station['id'] in all_stations:
-                        all_stations[station['id']]['data_types'].append('wind_speed')
-                    else:
-                        all_stations[station['id']] = {
-                            'name': station['name'],
-                            'location': station['location'],
-                            'data_types': ['wind_speed']
-                        }
-            
-            if wind_direction_data:
-                for station in wind_direction_data['data']['stations']:
-                    if station['id'] in all_stations:
-                        all_stations[station['id']]['data_types'].append('wind_direction')
-                    else:
-                        all_stations[station['id']] = {
-                            'name': station['name'],
-                            'location': station['location'],
-                            'data_types': ['wind_direction']
-                        }
+            for payload, flag in ((rainfall_data, _HAS_RAINFALL),
+                                  (wind_speed_data, _HAS_WIND_SPEED),
+                                  (wind_direction_data, _HAS_WIND_DIRECTION)):
+                if payload:
+                    _merge_station_types(all_stations, payload, flag)
             
             if not all_stations:
-                await update.message.reply_text(
-                    "❌ **Error**: Unable to fetch station data. Please try again later.",
-                    parse_mode=ParseMode.MARKDOWN
+                await update.effective_message.reply_text(
+                    "❌ <b>Error</b>: Unable to fetch station data. Please try again later.",
+                    parse_mode=ParseMode.HTML
                 )
                 return
             
-            # Sort stations by name
-            sorted_stations = sorted(all_stations.items(), key=lambda x: x[1]['name'])
-            
-            # Create station list message
-            message_parts = ["📍 **Available Weather Stations**\n"]
-            
-            for station_id, station_info in sorted_stations:
-                data_types = station_info['data_types']
-                
-                # Create data type indicators
-                indicators = []
-                if 'rainfall' in data_types:
-                    indicators.append("🌧️")
-                if 'wind_speed' in data_types:
-                    indicators.append("💨")
-                if 'wind_direction' in data_types:
-                    indicators.append("🧭")
-                
-                indicators_str = "".join(indicators)
-                
-                station_line = f"• **{station_info['name']}** ({station_id}) {indicators_str}"
-                message_parts.append(station_line)
-            
-            message_parts.append("\n**Legend:**")
-            message_parts.append("🌧️ Rainfall data available")
-            message_parts.append("💨 Wind speed data available")
-            message_parts.append("🧭 Wind direction data available")
-            
-            message_parts.append("\n**Usage Examples:**")
-            message_parts.append("• `/rainfall S108` - Get rainfall at Marina Gardens")
-            message_parts.append("• `/windspeed marina` - Get wind speed at Marina area")
-            message_parts.append("• `/winddirection sentosa` - Get wind direction at Sentosa")
-            
-            message = "\n".join(message_parts)
-            
-            # Split message if too long
-            if len(message) > MAX_MESSAGE_LENGTH:
-                # Split at logical points
-                legend_start = message.find("\n**Legend:**")
-                if legend_start > 0:
-                    stations_message = message[:legend_start]
-                    legend_message = message[legend_start:]
-                    
-                    await update.message.reply_text(stations_message, parse_mode=ParseMode.MARKDOWN)
-                    await update.message.reply_text(legend_message, parse_mode=ParseMode.MARKDOWN)
-                else:
-                    # Split by number of stations
-                    lines = message.split('\n')
-                    current_message = lines[0] + '\n'
-                    
-                    for line in lines[1:]:
-                        if len(current_message + line + '\n') > MAX_MESSAGE_LENGTH:
-                            await update.message.reply_text(current_message, parse_mode=ParseMode.MARKDOWN)
-                            current_message = line + '\n'
-                        else:
-                            current_message += line + '\n'
-                    
-                    if current_message.strip():
-                        await update.message.reply_text(current_message, parse_mode=ParseMode.MARKDOWN)
-            else:
-                await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
-    
+            chunks = _render_stations_message(all_stations)
+            _stations_message_cache = (time.monotonic(), roster_key, chunks)
+        
+        await _reply_chunks(update, chunks)
+
     except Exception as e:
-        logger.error(f"Error in stations_handler: {e}")
-        await update.message.reply_text(
-            "❌ **Error**: Failed to fetch station information. Please try again later.",
-            parse_mode=ParseMode.MARKDOWN
+        logger.error("Error in stations_handler: %s", e)
+        await update.effective_message.reply_text(
+            "❌ <b>Error</b>: Failed to fetch station information. Please try again later.",
+            parse_mode=ParseMode.HTML
         )
 
 async def wind_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /wind command - shows both windspeed and winddirection from all stations or specific station"""
     # Check if user specified a station or "all"
-    station_query = ' '.join(context.args).strip() if context.args else None
+    query_text, station_query = _parse_station_query(context)
     
     if station_query:
-        await update.message.reply_text(f"🔄 Fetching wind data for '{station_query}'...")
+        placeholder_text = f"🔄 Fetching wind data for '{query_text}'..."
     else:
-        await update.message.reply_text("🔄 Fetching wind data from all stations...")
+        placeholder_text = "🔄 Fetching wind data from all stations..."
     
     try:
-        async with WeatherAPI() as api:
-            wind_speed_data, wind_direction_data = await asyncio.gather(
-                api.get_wind_speed_data(),
-                api.get_wind_direction_data()
+        api = WeatherAPI.instance()
+        wind_speed_data, wind_direction_data = await _fetch_with_placeholder(
+            update, placeholder_text,
+            asyncio.gather(api.get_wind_speed_data(), api.get_wind_direction_data())
+        )
+        
+        if not wind_speed_data and not wind_direction_data:
+            await update.effective_message.reply_text(
+                "❌ <b>Error</b>: Unable to fetch wind data. Please try again later.",
+                parse_mode=ParseMode.HTML
             )
-            
-            if not wind_speed_data and not wind_direction_data:
-                await update.message.reply_text(
-                    "❌ **Error**: Unable to fetch wind data. Please try again later.",
-                    parse_mode=ParseMode.MARKDOWN
-                )
-                return
-            
-            # Collect all wind station data
-            wind_stations = {}
-            
-            # Add wind speed data
-            if wind_speed_data:
-                for station in wind_speed_data['data']['stations']:
+            return
+        
+        # Collect all wind station data
+        wind_stations = {}
+        
+        # Add wind speed data
+        if wind_speed_data:
+            speed_index = api.index_readings(wind_speed_data['data']['readings'])
+            for station in wind_speed_data['data']['stations']:
+                wind_stations[station['id']] = {
+                    'name': station['name'],
+                    'speed': speed_index.get(station['id']),
+                    'direction': None
+                }
+        
+        # Add wind direction data
+        if wind_direction_data:
+            direction_index = api.index_readings(wind_direction_data['data']['readings'])
+            for station in wind_direction_data['data']['stations']:
+                if station['id'] in wind_stations:
+                    wind_stations[station['id']]['direction'] = direction_index.get(station['id'])
+                else:
                     wind_stations[station['id']] = {
                         'name': station['name'],
-                        'speed': api.get_station_reading(wind_speed_data['data']['readings'], station['id']),
-                        'direction': None,
-                        'direction_text': None
+                        'speed': None,
+                        'direction': direction_index.get(station['id'])
                     }
+        
+        # Get timestamp from available data
+        timestamp = None
+        if wind_speed_data:
+            timestamp = api.format_timestamp(wind_speed_data['data']['readings'][0]['timestamp'])
+        elif wind_direction_data:
+            timestamp = api.format_timestamp(wind_direction_data['data']['readings'][0]['timestamp'])
+        
+        if station_query == "all":
+            # Show all stations data
+            message_parts = ["🌬️ <b>Complete Wind Data (All Stations)</b>\n\n"]
+            if timestamp:
+                message_parts.append(f"📅 <b>Time</b>: {timestamp}\n\n")
             
-            # Add wind direction data
-            if wind_direction_data:
-                for station in wind_direction_data['data']['stations']:
-                    if station['id'] in wind_stations:
-                        direction = api.get_station_reading(wind_direction_data['data']['readings'], station['id'])
-                        wind_stations[station['id']]['direction'] = direction
-                        wind_stations[station['id']]['direction_text'] = get_wind_direction_text(direction) if direction is not None else None
-                    else:
-                        direction = api.get_station_reading(wind_direction_data['data']['readings'], station['id'])
-                        wind_stations[station['id']] = {
-                            'name': station['name'],
-                            'speed': None,
-                            'direction': direction,
-                            'direction_text': get_wind_direction_text(direction) if direction is not None else None
-                        }
-            
-            # Get timestamp from available data
-            timestamp = None
-            if wind_speed_data:
-                timestamp = api.format_timestamp(wind_speed_data['data']['readings'][0]['timestamp'])
-            elif wind_direction_data:
-                timestamp = api.format_timestamp(wind_direction_data['data']['readings'][0]['timestamp'])
-            
-            if station_query and station_query.lower() == "all":
-                # Show all stations data
-                message = "🌬️ **Complete Wind Data (All Stations)**\n\n"
-                if timestamp:
-                    message += f"📅 **Time**: {timestamp}\n\n"
-                
-                # Sort stations by name
-                sorted_stations = sorted(wind_stations.items(), key=lambda x: x[1]['name'])
-                
-                # Build message with all wind data
-                for station_id, data in sorted_stations:
-                    message += f"📍 **{data['name']}** ({station_id})\n"
-                    
-                    # Wind speed
-                    if data['speed'] is not None:
-                        message += f"💨 Speed: {data['speed']:.1f} knots"
-                    else:
-                        message += "💨 Speed: No data"
-                    
-                    # Wind direction
-                    if data['direction'] is not None:
-                        message += f" | 🧭 Direction: {data['direction']}° ({data['direction_text']})\n"
-                    else:
-                        message += " | 🧭 Direction: No data\n"
-                    
-                    message += "\n"
-                
-                message += "💡 *Use `/wind [station]` for specific station details*"
-                
-            elif station_query:
-                # Find specific station
-                station_id = STATION_ALIASES.get(station_query.lower())
-                target_station = None
-                target_station_id = None
+            # Sort stations by name
+            rows = [(data['name'], station_id, data) for station_id, data in wind_stations.items()]
+            rows.sort(key=itemgetter(0))
+            
+            # Build message with all wind data
+            for _, station_id, data in rows:
+                message_parts.append(f"📍 <b>{escape(data['name'])}</b> ({station_id})\n")
                 
-                if station_id and station_id in wind_stations:
-                    target_station = wind_stations[station_id]
-                    target_station_id = station_id
+                # Wind speed
+                if data['speed'] is not None:
+                    message_parts.append(f"💨 Speed: {data['speed']:.1f} knots")
                 else:
-                    # Search by name or ID
-                    for sid, station_data in wind_stations.items():
-                        if (station_query.lower() in station_data['name'].lower() or 
-                            station_query.upper() == sid):
-                            target_station = station_data
-                            target_station_id = sid
-                            break
-                
-                if not target_station:
-                    await update.message.reply_text(
-                        f"❌ **Station not found**: '{station_query}'\n\n"
-                        "Wind data is only available at selected stations.\n"
-                        "Use /stations to see available stations or try `all` to see all stations.",
-                        parse_mode=ParseMode.MARKDOWN
-                    )
-                    return
+                    message_parts.append("💨 Speed: No data")
                 
-                # Build message for specific station
-                message = f"🌬️ **Wind Data - {target_station['name']}**\n\n"
-                message += f"📍 **Station**: {target_station['name']} ({target_station_id})\n"
-                if timestamp:
-                    message += f"📅 **Time**: {timestamp}\n\n"
-                
-                # Wind speed details
-                if target_station['speed'] is not None:
-                    message += f"💨 **Wind Speed**: {target_station['speed']:.1f} knots\n"
-                    
-                    # Wind speed categories (Beaufort scale approximation)
-                    if target_station['speed'] < 1:
-                        message += "🌬️ *Calm*\n"
-                    elif target_station['speed'] < 7:
-                        message += "🍃 *Light breeze*\n"
-                    elif target_station['speed'] < 17:
-                        message += "💨 *Moderate breeze*\n"
-                    elif target_station['speed'] < 28:
-                        message += "🌪️ *Strong breeze*\n"
-                    else:
-                        message += "⛈️ *Very strong wind*\n"
+                # Wind direction
+                if data['direction'] is not None:
+                    message_parts.append(f" | 🧭 Direction: {data['direction']}° ({get_wind_direction_text(data['direction'])})\n")
                 else:
-                    message += "💨 **Wind Speed**: No data\n"
+                    message_parts.append(" | 🧭 Direction: No data\n")
                 
-                # Wind direction details
-                if target_station['direction'] is not None:
-                    message += f"🧭 **Wind Direction**: {target_station['direction']}° ({target_station['direction_text']})\n"
-                    
-                    # Add compass emoji based on direction
-                    direction = target_station['direction']
-                    if 337.5 <= direction or direction < 22.5:
-                        message += "⬆️ *Wind from North*\n"
-                    elif 22.5 <= direction < 67.5:
-                        message += "↗️ *Wind from Northeast*\n"
-                    elif 67.5 <= direction < 112.5:
-                        message += "➡️ *Wind from East*\n"
-                    elif 112.5 <= direction < 157.5:
-                        message += "↘️ *Wind from Southeast*\n"
-                    elif 157.5 <= direction < 202.5:
-                        message += "⬇️ *Wind from South*\n"
-                    elif 202.5 <= direction < 247.5:
-                        message += "↙️ *Wind from Southwest*\n"
-                    elif 247.5 <= direction < 292.5:
-                        message += "⬅️ *Wind from West*\n"
-                    elif 292.5 <= direction < 337.5:
-                        message += "↖️ *Wind from Northwest*\n"
+                message_parts.append("\n")
+            
+            message_parts.append("💡 <i>Use <code>/wind [station]</code> for specific station details</i>")
+            
+        elif station_query:
+            # Find specific station
+            station_id = lookup_station(station_query)
+            target_station = None
+            target_station_id = None
+            
+            if station_id and station_id in wind_stations:
+                target_station = wind_stations[station_id]
+                target_station_id = station_id
+            elif station_query.upper() in wind_stations:
+                # Search by ID
+                target_station_id = station_query.upper()
+                target_station = wind_stations[target_station_id]
+            else:
+                # Search by name, using the cached per-list name index
+                for payload in (wind_speed_data, wind_direction_data):
+                    if not payload:
+                        continue
+                    station = api.find_station_by_name(payload['data']['stations'], station_query)
+                    if station and station['id'] in wind_stations:
+                        target_station_id = station['id']
+                        target_station = wind_stations[target_station_id]
+                        break
+            
+            if not target_station:
+                await update.effective_message.reply_text(
+                    f"❌ <b>Station not found</b>: '{escape(query_text)}'\n\n"
+                    "Wind data is only available at selected stations.\n"
+                    "Use /stations to see available stations or try <code>all</code> to see all stations.",
+                    parse_mode=ParseMode.HTML
+                )
+                return
+            
+            # Build message for specific station
+            message_parts = [f"🌬️ <b>Wind Data - {escape(target_station['name'])}</b>\n\n"]
+            message_parts.append(f"📍 <b>Station</b>: {escape(target_station['name'])} ({target_station_id})\n")
+            if timestamp:
+                message_parts.append(f"📅 <b>Time</b>: {timestamp}\n\n")
+            
+            # Wind speed details
+            if target_station['speed'] is not None:
+                message_parts.append(f"💨 <b>Wind Speed</b>: {target_station['speed']:.1f} knots\n")
+                
+                # Wind speed categories (Beaufort scale approximation)
+                if target_station['speed'] < 1:
+                    message_parts.append("🌬️ <i>Calm</i>\n")
+                elif target_station['speed'] < 7:
+                    message_parts.append("🍃 <i>Light breeze</i>\n")
+                elif target_station['speed'] < 17:
+                    message_parts.append("💨 <i>Moderate breeze</i>\n")
+                elif target_station['speed'] < 28:
+                    message_parts.append("🌪️ <i>Strong breeze</i>\n")
                 else:
-                    message += "🧭 **Wind Direction**: No data\n"
-                
-                message += "\n💡 *Use `/wind all` to see all stations or `/wind [station]` for other stations*"
-                
+                    message_parts.append("⛈️ <i>Very strong wind</i>\n")
             else:
-                # Show overall summary
-                message = "🌬️ **Wind Data Summary**\n\n"
-                if timestamp:
-                    message += f"📅 **Time**: {timestamp}\n\n"
+                message_parts.append("💨 <b>Wind Speed</b>: No data\n")
+            
+            # Wind direction details
+            if target_station['direction'] is not None:
+                message_parts.append(f"🧭 <b>Wind Direction</b>: {target_station['direction']}° ({get_wind_direction_text(target_station['direction'])})\n")
                 
-                # Calculate summary statistics
-                speed_values = [data['speed'] for data in wind_stations.values() if data['speed'] is not None]
-                direction_values = [data['direction'] for data in wind_stations.values() if data['direction'] is not None]
+                # Add compass emoji based on direction
+                arrow, name = get_compass_arrow(target_station['direction'])
+                message_parts.append(f"{arrow} <i>Wind from {name}</i>\n")
+            else:
+                message_parts.append("🧭 <b>Wind Direction</b>: No data\n")
+            
+            message_parts.append("\n💡 <i>Use <code>/wind all</code> to see all stations or <code>/wind [station]</code> for other stations</i>")
+            
+        else:
+            # Show overall summary
+            message_parts = ["🌬️ <b>Wind Data Summary</b>\n\n"]
+            if timestamp:
+                message_parts.append(f"📅 <b>Time</b>: {timestamp}\n\n")
+            
+            # Calculate summary statistics in a single pass
+            station_speeds = []
+            total_speed = 0
+            min_speed = None
+            max_speed = None
+            direction_count = 0
+            
+            for data in wind_stations.values():
+                speed = data['speed']
+                if speed is not None:
+                    station_speeds.append((data['name'], speed))
+                    total_speed += speed
+                    if min_speed is None or speed < min_speed:
+                        min_speed = speed
+                    if max_speed is None or speed > max_speed:
+                        max_speed = speed
+                if data['direction'] is not None:
+                    direction_count += 1
+            
+            if station_speeds:
+                avg_speed = total_speed / len(station_speeds)
                 
-                if speed_values:
-                    avg_speed = sum(speed_values) / len(speed_values)
-                    max_speed = max(speed_values)
-                    min_speed = min(speed_values)
-                    
-                    message += f"💨 **Wind Speed Statistics**:\n"
-                    message += f"• Average: {avg_speed:.1f} knots\n"
-                    message += f"• Range: {min_speed:.1f} - {max_speed:.1f} knots\n"
-                    message += f"• Active stations: {len(speed_values)}\n\n"
-                    
-                    # Show top 3 stations with highest wind speed
-                    station_speeds = [(data['name'], data['speed']) for data in wind_stations.values() if data['speed'] is not None]
-                    station_speeds.sort(key=lambda x: x[1], reverse=True)
-                    
-                    if station_speeds:
-                        message += "🏆 **Highest Wind Speed Locations**:\n"
-                        for i, (name, speed) in enumerate(station_speeds[:3], 1):
-                            message += f"{i}. {name}: {speed:.1f} knots\n"
-                        message += "\n"
+                message_parts.append(f"💨 <b>Wind Speed Statistics</b>:\n")
+                message_parts.append(f"• Average: {avg_speed:.1f} knots\n")
+                message_parts.append(f"• Range: {min_speed:.1f} - {max_speed:.1f} knots\n")
+                message_parts.append(f"• Active stations: {len(station_speeds)}\n\n")
                 
-                if direction_values:
-                    message += f"🧭 **Wind Direction Data**: Available from {len(direction_values)} stations\n\n"
+                # Show top 3 stations with highest wind speed
+                station_speeds.sort(key=itemgetter(1), reverse=True)
                 
-                message += "💡 *Use `/wind [station]` for specific station data or `/wind all` to see all stations*"
+                if station_speeds:
+                    message_parts.append("🏆 <b>Highest Wind Speed Locations</b>:\n")
+                    for i, (name, speed) in enumerate(station_speeds[:3], 1):
+                        message_parts.append(f"{i}. {escape(name)}: {speed:.1f} knots\n")
+                    message_parts.append("\n")
             
-            # Split message if too long
-            if len(message) > MAX_MESSAGE_LENGTH:
-                # Split at station boundaries
-                lines = message.split('\n')
-                current_message = lines[0] + '\n' + lines[1] + '\n\n'  # Include header
-                
-                for line in lines[2:]:
-                    if len(current_message + line + '\n') > MAX_MESSAGE_LENGTH:
-                        await update.message.reply_text(current_message, parse_mode=ParseMode.MARKDOWN)
-                        current_message = line + '\n'
-                    else:
-                        current_message += line + '\n'
-                
-                if current_message.strip():
-                    await update.message.reply_text(current_message, parse_mode=ParseMode.MARKDOWN)
-            else:
-                await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
-    
+            if direction_count:
+                message_parts.append(f"🧭 <b>Wind Direction Data</b>: Available from {direction_count} stations\n\n")
+            
+            message_parts.append("💡 <i>Use <code>/wind [station]</code> for specific station data or <code>/wind all</code> to see all stations</i>")
+        
+        message = "".join(message_parts)
+        
+        # Split message if too long
+        if len(message) > MAX_MESSAGE_LENGTH:
+            # Split at line boundaries
+            await _reply_chunks(update, _split_message(message.split('\n'), '\n'))
+        else:
+            await update.effective_message.reply_text(message, parse_mode=ParseMode.HTML)
+
     except Exception as e:
-        logger.error(f"Error in wind_handler: {e}")
-        await update.message.reply_text(
-            "❌ **Error**: Failed to fetch wind data. Please try again later.",
-            parse_mode=ParseMode.MARKDOWN
+        logger.error("Error in wind_handler: %s", e)
+        await update.effective_message.reply_text(
+            "❌ <b>Error</b>: Failed to fetch wind data. Please try again later.",
+            parse_mode=ParseMode.HTML
         )
 
+# Callback data -> (handler, context.args to run it with)
+CALLBACK_MAP = {
+    "weather": (weather_handler, None),
+    "rainfall": (rainfall_handler, None),
+    "rainfall_all": (rainfall_handler, ["all"]),
+    "windspeed": (wind_speed_handler, None),
+    "windspeed_all": (wind_speed_handler, ["all"]),
+    "winddirection": (wind_direction_handler, None),
+    "winddirection_all": (wind_direction_handler, ["all"]),
+    "wind": (wind_handler, None),
+    "stations": (stations_handler, None),
+}
+
 async def callback_query_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle callback queries from inline keyboard buttons"""
+    """Handle callback queries from inline keyboard buttons
+    
+    Handlers reply via update.effective_message, which for a callback query
+    is the message the button was attached to, so the update is passed on as is.
+    """
     query = update.callback_query
     await query.answer()
     
-    # Extract the callback data
-    data = query.data
-    
-    # Create a modified update object for callback queries
-    # This allows us to reuse existing handlers
-    callback_update = Update(
-        update_id=update.update_id,
-        message=query.message,
-        callback_query=query
-    )
-    
-    # Map callback data to appropriate handlers
-    if data == "weather":
-        await weather_handler(callback_update, context)
-    elif data == "rainfall":
-        await rainfall_handler(callback_update, context)
-    elif data == "rainfall_all":
-        # Create a new context with "all" argument
-        context.args = ["all"]
-        await rainfall_handler(callback_update, context)
-    elif data == "windspeed":
-        await wind_speed_handler(callback_update, context)
-    elif data == "windspeed_all":
-        # Create a new context with "all" argument
-        context.args = ["all"]
-        await wind_speed_handler(callback_update, context)
-    elif data == "winddirection":
-        await wind_direction_handler(callback_update, context)
-    elif data == "winddirection_all":
-        # Create a new context with "all" argument
-        context.args = ["all"]
-        await wind_direction_handler(callback_update, context)
-    elif data == "wind":
-        await wind_handler(callback_update, context)
-    elif data == "stations":
-        await stations_handler(callback_update, context)
-    else:
+    entry = CALLBACK_MAP.get(query.data)
+    if entry is None:
         await query.edit_message_text(
-            text="❌ **Error**: Unknown option selected.",
-            parse_mode=ParseMode.MARKDOWN
+            text="❌ <b>Error</b>: Unknown option selected.",
+            parse_mode=ParseMode.HTML
         )
+        return
+    
+    handler, args = entry
+    context.args = args
+    await handler(update, context)
 
 async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle errors"""
-    logger.error(f"Update {update} caused error {context.error}")
+    logger.error("Update %s caused error %s", update, context.error)
     
-    if update and update.message:
-        await update.message.reply_text(
-            "❌ **Error**: Something went wrong. Please try again later.\n\n"
+    if isinstance(update, Update) and update.effective_message:
+        await update.effective_message.reply_text(
+            "❌ <b>Error</b>: Something went wrong. Please try again later.\n\n"
             "If the problem persists, use /help for available commands.",
-            parse_mode=ParseMode.MARKDOWN
+            parse_mode=ParseMode.HTML
         )
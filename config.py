@@ -15,10 +15,18 @@ WIND_DIRECTION_API_URL = "https://api-open.data.gov.sg/v2/real-time/api/wind-dir
 # API request settings
 REQUEST_TIMEOUT = 10  # seconds
 MAX_RETRIES = 3
+MAX_RETRY_DELAY = 8  # seconds
+CACHE_TTL = 60  # seconds, matches upstream refresh cadence
+
+# Shared HTTP connection pool settings
+CONNECTION_LIMIT = 20
+DNS_CACHE_TTL = 300  # seconds
+KEEPALIVE_TIMEOUT = 60  # seconds
 
 # Message formatting
 MAX_MESSAGE_LENGTH = 4096
 STATIONS_PER_PAGE = 10
+STATIONS_MESSAGE_TTL = 300  # seconds to reuse the rendered /stations list
 
 # Common station mappings for user-friendly names
 STATION_ALIASES = {
@@ -43,33 +51,61 @@ STATION_ALIASES = {
     "scotts": "S111"
 }
 
-# Wind direction mappings
-WIND_DIRECTIONS = {
-    0: "N", 45: "NE", 90: "E", 135: "SE",
-    180: "S", 225: "SW", 270: "W", 315: "NW"
-}
+# Shortest alias prefix that lookup_station will complete
+MIN_ALIAS_PREFIX = 3
+
+# Key under which a trie node stores the station ID reachable from its prefix
+_TRIE_STATION = ""
+
+def _build_alias_trie(aliases):
+    """Build a dict-of-dicts trie over alias names
+    
+    Each node records the station ID its prefix leads to, or None when the
+    prefix is shared by aliases of different stations.
+    """
+    root = {}
+    for name, station_id in aliases.items():
+        node = root
+        for char in name:
+            node = node.setdefault(char, {})
+            previous = node.get(_TRIE_STATION, station_id)
+            node[_TRIE_STATION] = station_id if previous == station_id else None
+    return root
+
+_ALIAS_TRIE = _build_alias_trie(STATION_ALIASES)
+
+def lookup_station(query_lower):
+    """Get the station ID for an alias or an unambiguous alias prefix"""
+    station_id = STATION_ALIASES.get(query_lower)
+    if station_id or len(query_lower) < MIN_ALIAS_PREFIX:
+        return station_id
+    
+    node = _ALIAS_TRIE
+    for char in query_lower:
+        node = node.get(char)
+        if node is None:
+            return None
+    return node.get(_TRIE_STATION)
+
+# Compass arrow and name for each 45° sector, starting at North
+COMPASS_ARROWS = (
+    ("⬆️", "North"), ("↗️", "Northeast"), ("➡️", "East"), ("↘️", "Southeast"),
+    ("⬇️", "South"), ("↙️", "Southwest"), ("⬅️", "West"), ("↖️", "Northwest")
+)
+
+# Wind direction abbreviations, in the same sector order
+WIND_DIRECTIONS = ("N", "NE", "E", "SE", "S", "SW", "W", "NW")
+
+def _compass_sector(degrees):
+    """Index of the 45° compass sector centred nearest to degrees"""
+    return int((degrees % 360 + 22.5) // 45) % 8
+
+def get_compass_arrow(degrees):
+    """Get the (arrow, name) pair for the 45° sector containing degrees"""
+    return COMPASS_ARROWS[_compass_sector(degrees)]
 
 def get_wind_direction_text(degrees):
     """Convert wind direction in degrees to compass direction"""
     if degrees is None:
         return "Unknown"
-    
-    # Normalize to 0-360 range
-    degrees = degrees % 360
-    
-    # Find closest direction
-    closest_direction = min(WIND_DIRECTIONS.keys(), key=lambda x: abs(x - degrees))
-    
-    # If within 22.5 degrees, return the direction, otherwise interpolate
-    if abs(degrees - closest_direction) <= 22.5:
-        return WIND_DIRECTIONS[closest_direction]
-    else:
-        # Find the two closest directions for interpolation
-        directions = sorted(WIND_DIRECTIONS.keys())
-        for i in range(len(directions)):
-            if degrees < directions[i]:
-                if i == 0:
-                    return f"{WIND_DIRECTIONS[315]}-{WIND_DIRECTIONS[directions[i]]}"
-                else:
-                    return f"{WIND_DIRECTIONS[directions[i-1]]}-{WIND_DIRECTIONS[directions[i]]}"
-        return f"{WIND_DIRECTIONS[directions[-1]]}-{WIND_DIRECTIONS[directions[0]]}"
+    return WIND_DIRECTIONS[_compass_sector(degrees)]
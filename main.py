@@ -3,31 +3,13 @@
 Singapore Weather Telegram Bot
 Main entry point for the bot application
 """
-from flask import Flask
-import threading
-
-app = Flask('')
-
-
-@app.route('/')
-def home():
-    return "I'm alive!"
-
-
-def run_web():
-    app.run(host='0.0.0.0', port=8080)
-
-
-def keep_alive():
-    t = threading.Thread(target=run_web)
-    t.start()
-
-
 import logging
 import asyncio
+from aiohttp import web
 from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters
 from telegram import BotCommand
 from config import BOT_TOKEN
+from weather_api import WeatherAPI
 from bot_handlers import (start_handler, help_handler, weather_handler,
                           rainfall_handler, wind_speed_handler,
                           wind_direction_handler, wind_handler,
@@ -40,6 +22,41 @@ logging.basicConfig(
     level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Runner for the keep-alive web server, set in post_init
+_keep_alive_runner = None
+
+
+async def keep_alive_home(request: web.Request) -> web.Response:
+    """Answer health-check pings"""
+    return web.Response(text="I'm alive!")
+
+
+async def start_keep_alive():
+    """Serve the keep-alive page from the bot's own event loop"""
+    global _keep_alive_runner
+    app = web.Application()
+    app.router.add_get('/', keep_alive_home)
+    _keep_alive_runner = web.AppRunner(app)
+    await _keep_alive_runner.setup()
+    await web.TCPSite(_keep_alive_runner, '0.0.0.0', 8080).start()
+
+
+async def post_init(application: Application):
+    """Open the shared weather API session and start the keep-alive server"""
+    await WeatherAPI.instance().start()
+    try:
+        await start_keep_alive()
+    except OSError as e:
+        # The bot can still poll without the keep-alive page
+        logger.error("Could not start keep-alive server: %s", e)
+
+
+async def post_shutdown(application: Application):
+    """Close the shared weather API session and stop the keep-alive server"""
+    await WeatherAPI.instance().close()
+    if _keep_alive_runner is not None:
+        await _keep_alive_runner.cleanup()
+
 
 def main():
     """Main function to run the bot"""
@@ -53,7 +70,10 @@ def main():
         raise ValueError("Bot token is required to run the bot")
 
     # Create application
-    application = Application.builder().token(BOT_TOKEN).build()
+    application = (Application.builder().token(BOT_TOKEN)
+                   .post_init(post_init)
+                   .post_shutdown(post_shutdown)
+                   .build())
 
     # Add command handlers
     application.add_handler(CommandHandler("start", start_handler))
@@ -80,7 +100,6 @@ def main():
 
     # Run the bot
     logger.info("Bot is running and polling for updates...")
-    keep_alive()
     application.run_polling(allowed_updates=["message", "callback_query"])
 
 
@@ -4,57 +4,150 @@ Weather API client for Singapore government weather data
 
 import asyncio
 import aiohttp
-import json
+import heapq
 import logging
+import orjson
+import random
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
 from config import (
     RAINFALL_API_URL, WIND_SPEED_API_URL, WIND_DIRECTION_API_URL,
-    REQUEST_TIMEOUT, MAX_RETRIES
+    REQUEST_TIMEOUT, MAX_RETRIES, MAX_RETRY_DELAY, CACHE_TTL,
+    CONNECTION_LIMIT, DNS_CACHE_TTL, KEEPALIVE_TIMEOUT, lookup_station
 )
 
 logger = logging.getLogger(__name__)
 
+# Number of station lists to keep lookup tables for
+MAX_STATION_INDEXES = 8
+
+# Client errors worth retrying (5xx are always retried); other 4xx fail immediately
+RETRYABLE_STATUSES = frozenset({408, 429})
+
+# In-process response cache: key -> (fetched_at, data)
+_CACHE: Dict[str, Tuple[float, Any]] = {}
+# Fetches currently in progress: key -> future resolved with the fetched data
+_INFLIGHT: Dict[str, asyncio.Future] = {}
+# Result handed to waiters when the fetching caller was cancelled
+_ABANDONED = object()
+
+async def cached_fetch(key: str, coro_factory: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+    """Return cached data for key if fresh, otherwise fetch and cache it.
+
+    Concurrent misses on the same key wait on the first caller's fetch
+    (single-flight), so at most one upstream request is in progress per key
+    and all waiters share its result, including a failure. If the fetching
+    caller is cancelled, the waiters start a new fetch instead. Failed
+    fetches (None) are not cached.
+    """
+    while True:
+        entry = _CACHE.get(key)
+        if entry and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        
+        inflight = _INFLIGHT.get(key)
+        if inflight is None:
+            break
+        # Shield so a cancelled waiter does not cancel the shared fetch
+        data = await asyncio.shield(inflight)
+        if data is not _ABANDONED:
+            return data
+    
+    future = asyncio.get_running_loop().create_future()
+    _INFLIGHT[key] = future
+    try:
+        data = await coro_factory()
+    except asyncio.CancelledError:
+        future.set_result(_ABANDONED)
+        raise
+    except Exception:
+        future.set_result(None)
+        raise
+    finally:
+        del _INFLIGHT[key]
+    
+    if data is not None:
+        _CACHE[key] = (time.monotonic(), data)
+    future.set_result(data)
+    return data
+
+class StationIndex(NamedTuple):
+    """Lookup tables for one station list"""
+    by_id: Dict[str, Dict]
+    by_name: Dict[str, Dict]
+    names_lower: List[Tuple[str, Dict]]
+
 class WeatherAPI:
     """Client for Singapore weather APIs"""
     
+    _instance = None
+    
     def __init__(self):
         self.session = None
+        # id(stations) -> (stations, StationIndex), see _station_index
+        self._station_indexes = {}
     
-    async def __aenter__(self):
-        """Async context manager entry"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
-        )
-        return self
+    @classmethod
+    def instance(cls) -> "WeatherAPI":
+        """Return the process-wide instance, whose session is shared by all handlers"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
     
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
+    async def start(self):
+        """Open the pooled HTTP session if it is not already open"""
+        if self.session is None or self.session.closed:
+            # aiohttp advertises gzip/deflate, and br when Brotli is installed
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=CONNECTION_LIMIT,
+                    ttl_dns_cache=DNS_CACHE_TTL,
+                    keepalive_timeout=KEEPALIVE_TIMEOUT
+                ),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+            )
+    
+    async def close(self):
+        """Close the HTTP session"""
+        if self.session and not self.session.closed:
             await self.session.close()
+        self.session = None
+    
+    async def _make_request(self, url: str, ttl: float = CACHE_TTL) -> Optional[Dict]:
+        """Make HTTP request, serving responses younger than ttl from cache"""
+        return await cached_fetch(url, lambda: self._fetch(url), ttl)
     
-    async def _make_request(self, url: str) -> Optional[Dict]:
-        """Make HTTP request with retry logic"""
+    async def _fetch(self, url: str) -> Optional[Dict]:
+        """Make HTTP request, retrying timeouts, connection errors and 408/429/5xx"""
+        if self.session is None or self.session.closed:
+            await self.start()
+        
         for attempt in range(MAX_RETRIES):
             try:
                 async with self.session.get(url) as response:
                     if response.status == 200:
-                        data = await response.json()
+                        data = orjson.loads(await response.read())
                         if data.get('code') == 0:
                             return data
                         else:
-                            logger.error(f"API returned error code: {data.get('code')}")
+                            logger.error("API returned error code: %s", data.get('code'))
                             return None
+                    elif response.status in RETRYABLE_STATUSES or response.status >= 500:
+                        logger.warning("HTTP %s for %s, attempt %s", response.status, url, attempt + 1)
                     else:
-                        logger.warning(f"HTTP {response.status} for {url}, attempt {attempt + 1}")
+                        logger.warning("HTTP %s for %s, not retrying", response.status, url)
+                        return None
                         
             except asyncio.TimeoutError:
-                logger.warning(f"Timeout for {url}, attempt {attempt + 1}")
+                logger.warning("Timeout for %s, attempt %s", url, attempt + 1)
             except Exception as e:
-                logger.error(f"Error requesting {url}: {e}, attempt {attempt + 1}")
+                logger.error("Error requesting %s: %s, attempt %s", url, e, attempt + 1)
             
             if attempt < MAX_RETRIES - 1:
-                await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                # Exponential backoff with jitter so concurrent retries spread out
+                await asyncio.sleep(min(MAX_RETRY_DELAY, 2 ** attempt + random.random()))
         
         return None
     
@@ -88,42 +181,104 @@ class WeatherAPI:
         # Handle exceptions in results
         processed_results = []
         for result in results:
-            if isinstance(result, Exception):
-                logger.error(f"Error in concurrent request: {result}")
+            if isinstance(result, BaseException):
+                logger.error("Error in concurrent request: %s", result)
                 processed_results.append(None)
             else:
                 processed_results.append(result)
         
         return tuple(processed_results)
     
+    def _station_index(self, stations: List[Dict]) -> StationIndex:
+        """Get lookup tables for a station list, building them on first use
+        
+        Station lists are reused while the response cache is fresh, so the
+        tables are kept per list object. The list itself is held alongside
+        them so its id cannot be recycled while cached.
+        """
+        entry = self._station_indexes.get(id(stations))
+        if entry is not None and entry[0] is stations:
+            return entry[1]
+        
+        by_id = {}
+        by_name = {}
+        names_lower = []
+        for station in stations:
+            name_lower = station['name'].lower()
+            by_id.setdefault(station['id'].upper(), station)
+            by_name.setdefault(name_lower, station)
+            names_lower.append((name_lower, station))
+        
+        index = StationIndex(by_id, by_name, names_lower)
+        if len(self._station_indexes) >= MAX_STATION_INDEXES:
+            self._station_indexes.pop(next(iter(self._station_indexes)))
+        self._station_indexes[id(stations)] = (stations, index)
+        return index
+    
+    def resolve_station(self, stations: List[Dict], query: str) -> Optional[Dict]:
+        """Resolve a user query to a station via alias, name or ID"""
+        by_id = self._station_index(stations).by_id
+        query_lower = query.lower()
+        
+        station_id = lookup_station(query_lower)
+        if station_id and station_id.upper() in by_id:
+            return by_id[station_id.upper()]
+        
+        station = self.find_station_by_name(stations, query_lower)
+        if station:
+            return station
+        
+        return by_id.get(query.upper())
+    
     def find_station_by_name(self, stations: List[Dict], search_name: str) -> Optional[Dict]:
-        """Find station by name (case-insensitive partial match)"""
+        """Find station by name (case-insensitive, exact match first, then partial)"""
+        index = self._station_index(stations)
         search_name = search_name.lower()
         
-        for station in stations:
-            if search_name in station['name'].lower():
+        station = index.by_name.get(search_name)
+        if station:
+            return station
+        
+        for name_lower, station in index.names_lower:
+            if search_name in name_lower:
                 return station
         
         return None
     
+    def stations_by_id(self, stations: List[Dict]) -> Dict[str, Dict]:
+        """Map upper-cased station ID to station, cached per station list"""
+        return self._station_index(stations).by_id
+    
     def find_station_by_id(self, stations: List[Dict], station_id: str) -> Optional[Dict]:
-        """Find station by ID"""
-        for station in stations:
-            if station['id'].upper() == station_id.upper():
-                return station
-        
-        return None
+        """Find station by ID (case-insensitive)"""
+        return self._station_index(stations).by_id.get(station_id.upper())
     
-    def format_timestamp(self, timestamp_str: str) -> str:
-        """Format timestamp for display"""
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def parse_timestamp(timestamp_str: str) -> Optional[datetime]:
+        """Parse an API timestamp into a timezone-aware datetime (memoized)"""
         try:
-            # Parse the timestamp
-            dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            # Convert to Singapore time and format
-            return dt.strftime("%d %b %Y, %I:%M %p SGT")
+            return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
         except Exception as e:
-            logger.error(f"Error formatting timestamp {timestamp_str}: {e}")
+            logger.error("Error parsing timestamp %s: %s", timestamp_str, e)
+            return None
+    
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def format_timestamp(timestamp_str: str) -> str:
+        """Format timestamp for display (memoized, readings share timestamps)"""
+        dt = WeatherAPI.parse_timestamp(timestamp_str)
+        if dt is None:
             return timestamp_str
+        # Timestamps are already in Singapore time
+        return dt.strftime("%d %b %Y, %I:%M %p SGT")
+    
+    @staticmethod
+    def index_readings(readings: List[Dict]) -> Dict[str, Optional[float]]:
+        """Map station ID to value for the latest reading"""
+        if not readings:
+            return {}
+        return {data_point['stationId']: data_point['value'] for data_point in readings[0].get('data', [])}
     
     def get_station_reading(self, readings: List[Dict], station_id: str) -> Optional[float]:
         """Get reading value for a specific station"""
@@ -139,24 +294,57 @@ class WeatherAPI:
         
         return None
     
-    def get_summary_stats(self, readings: List[Dict]) -> Dict:
-        """Get summary statistics from readings"""
+    def get_summary_stats(self, readings: List[Dict], stations: Optional[List[Dict]] = None, k: int = 3) -> Dict:
+        """Get summary statistics from readings in a single pass
+        
+        When stations are given, also returns the top k stations by value as
+        (name, id, value) tuples in descending order, and the (name, value)
+        pair of the highest reading that has station metadata.
+        """
+        empty = {"min": 0, "max": 0, "avg": 0, "count": 0, "top": [], "max_station": None}
         if not readings:
-            return {"min": 0, "max": 0, "avg": 0, "count": 0}
+            return empty
         
-        values = []
+        stations_by_id = self.stations_by_id(stations) if stations else {}
         latest_reading = readings[0]
         
-        for data_point in latest_reading.get('data', []):
-            if data_point['value'] is not None:
-                values.append(data_point['value'])
+        total = 0
+        count = 0
+        min_value = None
+        max_value = None
+        # Bounded min-heap of ((value, -position), name, id); earlier stations win ties
+        top_heap = []
+        
+        for position, data_point in enumerate(latest_reading.get('data', [])):
+            value = data_point['value']
+            if value is None:
+                continue
+            
+            total += value
+            count += 1
+            if min_value is None or value < min_value:
+                min_value = value
+            if max_value is None or value > max_value:
+                max_value = value
+            
+            station = stations_by_id.get(data_point['stationId'].upper())
+            if station and k > 0:
+                item = ((value, -position), station['name'], station['id'])
+                if len(top_heap) < k:
+                    heapq.heappush(top_heap, item)
+                elif item[0] > top_heap[0][0]:
+                    heapq.heapreplace(top_heap, item)
+        
+        if not count:
+            return empty
         
-        if not values:
-            return {"min": 0, "max": 0, "avg": 0, "count": 0}
+        top = [(name, station_id, key[0]) for key, name, station_id in sorted(top_heap, reverse=True)]
         
         return {
-            "min": min(values),
-            "max": max(values),
-            "avg": sum(values) / len(values),
-            "count": len(values)
+            "min": min_value,
+            "max": max_value,
+            "avg": total / count,
+            "count": count,
+            "top": top,
+            "max_station": (top[0][0], top[0][2]) if top else None
         }